@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import urllib.parse
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar
 from uuid import uuid4
 
-import yaml
 from aiodocker.docker import Docker
 from aiodocker.exceptions import DockerError
 from fastmcp.utilities.logging import get_logger
@@ -27,6 +30,40 @@ if TYPE_CHECKING:
 
 logger = get_logger("knowledge-base-mcp.crawl")
 
+
+@dataclass(frozen=True, slots=True)
+class CrawlParams:
+    """Crawl parameters derived from a seed URL."""
+
+    seed_url: str
+    domain: str
+    filter_pattern: str
+
+    def to_dict(self) -> dict[str, str]:
+        """Converts the parameters to the keyword arguments accepted by `Crawler.crawl_domain`."""
+        return {"seed_url": self.seed_url, "domain": self.domain, "filter_pattern": self.filter_pattern}
+
+
+@lru_cache(maxsize=1024)
+def _build_crawl_params(url: str) -> CrawlParams:
+    """Derives the crawl parameters for a URL, cached as the same seed URLs are validated and crawled repeatedly.
+
+    Returns:
+        CrawlParams: The immutable crawl parameters, safe to share between callers.
+    """
+    parsed = urllib.parse.urlparse(url)
+
+    path = parsed.path
+    filter_pattern = path
+
+    # if end of the url is a file, we need to crawl everything that matches the url up to the last `/` character
+    directory, separator, last_segment = path.rpartition("/")
+    if "." in last_segment:
+        filter_pattern = directory + separator or "/"
+
+    return CrawlParams(seed_url=url, domain=parsed.scheme + "://" + parsed.netloc, filter_pattern=filter_pattern)
+
+
 # endregion Crawler Settings
 
 
@@ -39,6 +76,9 @@ class Crawler:
 
     settings: CrawlerSettings
 
+    # Background pull of the crawler image, started when the Docker client is initialized
+    image_pull_task: asyncio.Task[None] | None = None
+
     # Container Label used to identify containers managed by this component
     MANAGED_BY_LABEL = "managed-by"
     MANAGED_BY_VALUE = "mcp-crawler"
@@ -46,6 +86,9 @@ class Crawler:
     DOMAIN_LABEL = "crawl-domain"
     CRAWL_CONFIG_PATH = "/config/crawl.yml"
 
+    # Final rule of every crawl: anything not explicitly allowed is skipped
+    DENY_ALL_RULE: ClassVar[dict[str, str]] = {"policy": "deny", "type": "regex", "pattern": ".*"}
+
     def __init__(
         self,
         settings: CrawlerSettings,
@@ -54,9 +97,15 @@ class Crawler:
         """Initializes the Crawler component."""
         self.elasticsearch_settings = elasticsearch_settings
 
+        # The crawler's output settings don't change between crawls, so build them once
+        self.crawler_es_settings = elasticsearch_settings.to_crawler_settings()
+
         self.settings = settings
         self.docker_socket = settings.docker_socket
 
+        # Bounds container starts when many crawls are requested at once, so they don't all hit the Docker daemon together
+        self.start_slots = asyncio.Semaphore(settings.max_concurrent_starts)
+
         logger.debug("Crawler component initialized with settings: %s", self.settings)
 
     async def async_init(self) -> None:
@@ -72,8 +121,14 @@ class Crawler:
 
         logger.debug("Docker client initialized.")
 
+        # Pull the image in the background so the first crawl doesn't pay for it
+        self._start_image_pull()
+
     async def async_shutdown(self) -> None:
         """Cleans up the Docker client for the crawler."""
+        if self.image_pull_task and not self.image_pull_task.done():
+            self.image_pull_task.cancel()
+
         try:
             await self.docker_client.close()
         except Exception as e:
@@ -97,7 +152,7 @@ class Crawler:
 
     # region Prepare Config
     @classmethod
-    async def _prepare_crawl_config_file(
+    def _prepare_crawl_config_file(
         cls,
         domain: str,
         seed_url: str,
@@ -109,6 +164,8 @@ class Crawler:
         """Generates the crawler configuration content (as YAML) in memory. This configuration is the Crawler configuration
         which is documented in https://github.com/elastic/crawler/blob/main/docs/CONFIG.md.
 
+        The config is written as JSON, which is valid YAML, as the json encoder is much faster than PyYAML's dumper.
+
         Returns:
             InjectFile: An object containing the generated config content and target path within the container.
 
@@ -128,21 +185,19 @@ class Crawler:
                     "crawl_rules": [
                         *additional_exclusion_rules,
                         {"policy": "allow", "type": "begins", "pattern": filter_pattern},
-                        {"policy": "deny", "type": "regex", "pattern": ".*"},
+                        cls.DENY_ALL_RULE,
                     ],
                 }
             ],
             "log_level": "DEBUG",
             "output_sink": "elasticsearch",
             "output_index": elasticsearch_index_name,
-            "elasticsearch": {
-                **crawler_es_settings,
-            },
+            "elasticsearch": crawler_es_settings,
         }
 
         config_container_path = cls.CRAWL_CONFIG_PATH
 
-        return InjectFile(filename=config_container_path, content=yaml.dump(config, indent=2))
+        return InjectFile(filename=config_container_path, content=json.dumps(config, indent=2))
 
     # endregion Prepare Config
 
@@ -162,20 +217,7 @@ class Crawler:
             A dictionary containing "page_url", "domain", "filter_pattern", and "elasticsearch_index_name".
 
         """
-        parsed = urllib.parse.urlparse(url)
-
-        path = parsed.path
-        filter_pattern = path
-
-        # if end of the url is a file, we need to crawl everything that matches the url up to the last `/` character
-        if not path.endswith("/") and "." in path.split("/")[-1]:
-            filter_pattern = path[: path.rfind("/") + 1] or "/"
-
-        return {
-            "seed_url": url,
-            "domain": parsed.scheme + "://" + parsed.netloc,
-            "filter_pattern": filter_pattern,
-        }
+        return _build_crawl_params(url).to_dict()
 
     # endregion Crawl Parameters
     # region Crawl Validation
@@ -199,11 +241,11 @@ class Crawler:
             CrawlerValidationTooManyURLsError: If the number of child URLs exceeds the limit.
 
         """
-        logger.debug(f"Validating url {url} for crawling")
+        logger.debug("Validating url %s for crawling", url)
 
         crawl_parameters = cls.derive_crawl_params(url)
 
-        logger.debug(f"Derived crawl parameters: {crawl_parameters}")
+        logger.debug("Derived crawl parameters: %s", crawl_parameters)
 
         try:
             extraction_result = await extract_urls_from_webpage(
@@ -221,13 +263,13 @@ class Crawler:
             raise CrawlerValidationNoIndexNofollowError(message=reason)
 
         num_urls = len(extraction_result["urls_to_crawl"])
-        logger.debug(f"Found {num_urls} URLs to crawl (excluding nofollow links).")
+        logger.debug("Found %d URLs to crawl (excluding nofollow links).", num_urls)
 
         if num_urls > max_child_page_limit:
-            reason = f"""
-            Could not validate crawl. Excessive child URLs ({num_urls} > {max_child_page_limit}).
-            Validate that you're crawling a specific enough URL or consider setting max_child_page_limit.
-            """
+            reason = (
+                f"Could not validate crawl. Excessive child URLs ({num_urls} > {max_child_page_limit}). "
+                "Validate that you're crawling a specific enough URL or consider setting max_child_page_limit."
+            )
             logger.error(reason)
             raise CrawlerValidationTooManyURLsError(message=reason)
 
@@ -236,13 +278,47 @@ class Crawler:
     # endregion Crawl Validation
 
     # region Image Handling
-    async def pull_crawler_image(self) -> None:
-        """Pulls the configured crawler Docker image."""
+    async def pull_crawler_image(self, force: bool = False) -> None:
+        """Pulls the configured crawler Docker image.
+
+        With the `if-not-present` pull policy, an image that is already present locally is used as is.
+
+        Args:
+            force (bool): Pull the image even if it is already present locally. Defaults to False.
+        """
         image_name = self.settings.docker_image
 
-        logger.debug(f"Pulling Docker image '{image_name}' for crawler...")
+        if not force and self.settings.pull_policy == "if-not-present" and await docker_utils.image_exists(self.docker_client, image_name):
+            logger.debug("Docker image '%s' for crawler is already present, skipping pull.", image_name)
+            return
+
+        await docker_utils.pull_image(self.docker_client, image_name)
+
+    def _start_image_pull(self) -> asyncio.Task[None]:
+        """Starts pulling the crawler image in the background, logging a failure even if no crawl ever waits for it."""
+        self.image_pull_task = asyncio.create_task(self.pull_crawler_image())
+        self.image_pull_task.add_done_callback(self._log_image_pull_failure)
+
+        return self.image_pull_task
+
+    @staticmethod
+    def _log_image_pull_failure(pull_task: asyncio.Task[None]) -> None:
+        """Retrieves and logs the exception of a failed image pull, so asyncio doesn't report it as never retrieved."""
+        if pull_task.cancelled():
+            return
 
-        await self.docker_client.images.pull(image_name)
+        if (exception := pull_task.exception()) is not None:
+            logger.error("Background pull of the crawler image failed", exc_info=exception)
+
+    async def ensure_crawler_image(self) -> None:
+        """Waits for the crawler image pull started at init, starting a new pull if that one failed or was never started."""
+        pull_task = self.image_pull_task
+
+        if not pull_task or (pull_task.done() and (pull_task.cancelled() or pull_task.exception() is not None)):
+            pull_task = self._start_image_pull()
+
+        # Shielded, as every crawl waits on the same pull and cancelling one waiter must not cancel it for the others
+        await asyncio.shield(pull_task)
 
     # endregion Image Handling
 
@@ -273,20 +349,23 @@ class Crawler:
             "container_id_123456"
 
         """
-        logger.debug(f"Attempting to start crawl for domain '{domain}' -> index '{elasticsearch_index_name}'")
+        logger.debug("Attempting to start crawl for domain '%s' -> index '%s'", domain, elasticsearch_index_name)
 
-        config_file_to_inject = await self._prepare_crawl_config_file(
+        config_file_to_inject = self._prepare_crawl_config_file(
             domain=domain,
             seed_url=seed_url,
             filter_pattern=filter_pattern,
             exclude_paths=exclude_paths,
             elasticsearch_index_name=elasticsearch_index_name,
-            crawler_es_settings=self.elasticsearch_settings.to_crawler_settings(),
+            crawler_es_settings=self.crawler_es_settings,
         )
 
         random_id = uuid4().hex[:8]
 
-        async with self.handle_errors("starting crawl container"):
+        async with self.handle_errors("pulling crawler image"):
+            await self.ensure_crawler_image()
+
+        async with self.start_slots, self.handle_errors("starting crawl container"):
             container_id = await docker_utils.start_container_with_files(
                 docker_client=self.docker_client,
                 container_name=f"mcp-crawler-{elasticsearch_index_name}-{random_id}",
@@ -299,7 +378,9 @@ class Crawler:
                 },
             )
 
-            logger.info(f"Started crawl for domain '{domain}' -> index '{elasticsearch_index_name}' with container ID '{container_id}'")
+            logger.info(
+                "Started crawl for domain '%s' -> index '%s' with container ID '%s'", domain, elasticsearch_index_name, container_id
+            )
 
             return container_id
 
@@ -311,17 +392,18 @@ class Crawler:
         label_filter = f"{self.MANAGED_BY_LABEL}={self.MANAGED_BY_VALUE}"
 
         async with self.handle_errors("listing crawl containers"):
-            return await docker_utils.get_containers_details(self.docker_client, label_filter)
+            return await docker_utils.get_containers_details(self.docker_client, [label_filter])
 
-    async def get_crawl_logs(self, container_id: str) -> str:
+    async def get_crawl_logs(self, container_id: str, tail: int | None = None) -> str:
         """Gets logs for a specific crawl container.
 
         Args:
             container_id (str): The ID of the container to retrieve logs for.
+            tail (int | None): Optional number of lines to return from the end of the logs. Defaults to all lines.
 
         """
         async with self.handle_errors("getting crawl logs"):
-            return await docker_utils.container_logs(self.docker_client, container_id)
+            return await docker_utils.container_logs(self.docker_client, container_id, tail=tail)
 
     async def stop_crawl(self, container_id: str) -> None:
         """Stops and removes a specific crawl container.
@@ -339,27 +421,41 @@ class Crawler:
 
     async def remove_completed_crawls(self) -> dict[str, Any]:
         """Removes all completed (exited) crawl containers managed by this component.
-        Returns a summary of the operation.
+        Returns a summary of the operation, failed removals are listed in it rather than aborting the others.
         """
         logger.info("Attempting to remove completed crawl containers...")
 
         async with self.handle_errors("removing completed crawl containers"):
-            crawler_containers = await docker_utils.get_containers(
-                self.docker_client, f"{self.MANAGED_BY_LABEL}={self.MANAGED_BY_VALUE}", all_containers=True
+            completed_crawls = await docker_utils.get_containers(
+                self.docker_client, [f"{self.MANAGED_BY_LABEL}={self.MANAGED_BY_VALUE}"], all_containers=True, status="exited"
             )
 
-        completed_crawls = [container for container in crawler_containers if container["State"] == "exited"]
+        logger.debug("Found %d completed crawls.", len(completed_crawls))
 
-        logger.debug(f"Found {len(completed_crawls)} completed crawls.")
+        removal_slots = asyncio.Semaphore(docker_utils.MAX_CONCURRENT_REMOVALS)
 
-        async with self.handle_errors("removing completed crawl containers"):
-            [await docker_utils.remove_container(self.docker_client, container["Id"]) for container in completed_crawls]
+        async def remove_crawl(container_id: str) -> None:
+            async with removal_slots:
+                await docker_utils.remove_container(self.docker_client, container_id)
+
+        removal_results = await asyncio.gather(*(remove_crawl(container["Id"]) for container in completed_crawls), return_exceptions=True)
+
+        errors = [
+            {"container_id": container["Id"][:12], "error": str(result)}
+            for container, result in zip(completed_crawls, removal_results, strict=True)
+            if isinstance(result, BaseException)
+        ]
+
+        if errors:
+            logger.error("Failed to remove %d completed crawl(s): %s", len(errors), errors)
+
+        removed = len(completed_crawls) - len(errors)
 
-        logger.info(f"Removed {len(completed_crawls)} completed crawls.")
+        logger.info("Removed %d completed crawls.", removed)
 
         return {
-            "removed": len(completed_crawls),
-            "total": len(crawler_containers),
+            "removed": removed,
+            "errors": errors,
         }
 
     # endregion Cleanup
@@ -1,14 +1,17 @@
 """Utility functions for interacting with Docker."""
 
-import datetime
+import asyncio
+import functools
 import io
 import logging
 import tarfile
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from typing import Any
 
+import aiohttp
 from aiodocker.docker import Docker, DockerContainer
 from aiodocker.exceptions import DockerError
 
@@ -23,44 +26,115 @@ class InjectFile:
     """Represents a file to be injected into a container."""
 
     filename: str  # Full path *inside* the container (e.g., "/app/config.yml")
-    content: str  # File content as a string
+    content: str | bytes  # File content, strings are encoded as UTF-8
+
+    def add_to_tar(self, tar: tarfile.TarFile, mtime: int) -> None:
+        """Adds the file content to an open tar archive, with the given modification time."""
+        file_bytes = self.content if isinstance(self.content, bytes) else self.content.encode("utf-8")
+        tarinfo = tarfile.TarInfo(name=self.filename.lstrip("/"))
+        tarinfo.size = len(file_bytes)
+        tarinfo.mtime = mtime
+        tar.addfile(tarinfo, io.BytesIO(file_bytes))
 
     def to_tar_stream(self) -> io.BytesIO:
         """Converts the file content to a tar stream."""
-        tar_stream = io.BytesIO()
+        return files_to_tar_stream([self])
+
+
+def files_to_tar_stream(files: list[InjectFile]) -> io.BytesIO:
+    """Packs several files into a single tar stream, so they can be injected with one archive upload."""
+    tar_stream = io.BytesIO()
+
+    # Every file in the archive shares one modification time, so read the clock once
+    mtime = int(time.time())
 
-        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            file_bytes = self.content.encode("utf-8")
-            tarinfo = tarfile.TarInfo(name=self.filename.lstrip("/"))
-            tarinfo.size = len(file_bytes)
-            tarinfo.mtime = int(datetime.datetime.now(datetime.UTC).timestamp())
-            tar.addfile(tarinfo, io.BytesIO(file_bytes))
+    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        for file in files:
+            file.add_to_tar(tar, mtime)
 
-        tar_stream.seek(0)
+    tar_stream.seek(0)
 
-        return tar_stream
+    return tar_stream
 
 
 @asynccontextmanager
 async def handle_errors(operation: str) -> AsyncIterator[None]:
     """Context manager for error handling."""
-    logger.debug(f"Attempting {operation}...")
+    logger.debug("Attempting %s...", operation)
 
     try:
         yield
     except DockerError:
-        logger.exception(f"Docker error during {operation}")
+        logger.exception("Docker error during %s", operation)
         raise
     except Exception:
-        logger.exception(f"Unexpected error during {operation}")
+        logger.exception("Unexpected error during %s", operation)
+        raise
+
+    logger.debug("Completed %s.", operation)
+
+
+# aiodocker reports failures to reach the daemon, such as a keep-alive socket dropped by a daemon restart, with this status
+DOCKER_CONNECTION_ERROR_STATUS = 900
+
+
+def retry_on_stale_connection[**P, R](func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Retries a Docker call once if it failed because the pooled connection to the daemon had gone stale.
+
+    Only use this for calls that are safe to repeat and that don't stream their results.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        try:
+            return await func(*args, **kwargs)
+        except (DockerError, aiohttp.ClientConnectionError) as e:
+            if isinstance(e, DockerError) and e.status != DOCKER_CONNECTION_ERROR_STATUS:
+                raise
+
+            logger.warning("Lost the connection to the Docker daemon during %s, retrying once...", func.__name__)
+
+        return await func(*args, **kwargs)
+
+    return wrapper
+
+
+# region Images
+
+# Status the Docker daemon answers with when an image isn't present locally
+DOCKER_NOT_FOUND_STATUS = 404
+
+
+@retry_on_stale_connection
+async def image_exists(docker_client: Docker, image_name: str) -> bool:
+    """Checks whether an image is present locally, without contacting its registry."""
+    try:
+        await docker_client.images.inspect(image_name)
+    except DockerError as e:
+        if e.status == DOCKER_NOT_FOUND_STATUS:
+            return False
         raise
 
-    logger.debug(f"Completed {operation}.")
+    return True
+
 
+@retry_on_stale_connection
+async def pull_image(docker_client: Docker, image_name: str) -> None:
+    """Pulls an image from its registry."""
+    logger.debug("Pulling image '%s'...", image_name)
+
+    async with handle_errors("image pull"):
+        await docker_client.images.pull(image_name)
+
+    logger.debug("Pulled image '%s'.", image_name)
+
+
+# endregion Images
 
 # region Start Container
 
 
+# Not retried on a stale connection, repeating a create or start whose response was lost could leave a duplicate container behind
 async def start_container_with_files(
     docker_client: Docker,
     image_name: str,
@@ -71,6 +145,8 @@ async def start_container_with_files(
 ) -> str:
     """Creates a container, injects files into it, and then starts it.
 
+    The image must already be present locally, pull it beforehand.
+
     Args:
         docker_client: Docker client instance.
         image_name: Name of the Docker image to use.
@@ -94,8 +170,6 @@ async def start_container_with_files(
     12-character container ID is returned.
 
     """
-    container: DockerContainer | None = None
-
     container_config = {
         "Image": image_name,
         "Cmd": command,
@@ -104,59 +178,84 @@ async def start_container_with_files(
         "MemoryReservation": 512 * 1024 * 1024,  # 512 MB
     }
 
-    logger.debug(f"Preparing container '{container_name or 'unnamed'}' for image '{image_name}' with labels {labels}")
-
-    async with handle_errors("image pull"):
-        await docker_client.images.pull(image_name)
+    logger.debug("Preparing container '%s' for image '%s' with labels %s", container_name or "unnamed", image_name, labels)
 
     async with handle_errors("container setup"):
         container = await docker_client.containers.create(config=container_config, name=container_name)
-        logger.debug(f"Created container '{container.id}'.")
+
+    container_id = container.id
+    logger.debug("Created container '%s'.", container_id)
 
     if files_to_inject:
-        logger.debug(f"Preparing to inject {len(files_to_inject)} file(s) into container '{container.id}'.")
-        [await container.put_archive(path="/", data=file.to_tar_stream()) for file in files_to_inject]
+        logger.debug("Preparing to inject %d file(s) into container '%s'.", len(files_to_inject), container_id)
+        await container.put_archive(path="/", data=files_to_tar_stream(files_to_inject))
 
     async with handle_errors("container start"):
         await container.start()
 
-    return container.id
+    return container_id
 
 
 # endregion Start Container
 
 
 # region Container Info
-async def get_containers(docker_client: Docker, label_filter: str, all_containers: bool = False) -> list[DockerContainer]:
-    """Lists containers matching a label filter, returning basic info."""
-    label_filter_str = label_filter if "=" in label_filter else f"{label_filter}"
+@retry_on_stale_connection
+async def get_containers(
+    docker_client: Docker, label_filters: list[str], all_containers: bool = False, status: str | None = None
+) -> list[DockerContainer]:
+    """Lists containers matching all of the given label filters, returning basic info.
+
+    Args:
+        docker_client: Docker client instance.
+        label_filters: Label filters in the form `key` or `key=value`, all of which are matched in the Docker daemon.
+        all_containers: Whether to include containers that are not running.
+        status: Optional container status (e.g. `exited`) to filter on in the Docker daemon.
 
-    logger.debug(f"Listing containers with label filter '{label_filter_str}'...")
+    """
+    filters: dict[str, list[str]] = {"label": label_filters}
+
+    if status is not None:
+        filters["status"] = [status]
+
+    logger.debug("Listing containers with filters %s...", filters)
 
     async with handle_errors("container list"):
-        containers = await docker_client.containers.list(all=all_containers, filters={"label": [label_filter_str]})
+        containers = await docker_client.containers.list(all=all_containers, filters=filters)
 
-    logger.debug(f"Found {len(containers)} container(s) matching label filter '{label_filter_str}'.")
+    logger.debug("Found %d container(s) matching label filters %s.", len(containers), label_filters)
 
     return containers
 
 
-async def get_containers_details(docker_client: Docker, label_filter: str, all_containers: bool = False) -> list[dict[str, Any]]:
-    """Lists containers matching a label filter, returning detailed info."""
-    containers = await get_containers(docker_client, label_filter, all_containers)
+async def get_containers_details(docker_client: Docker, label_filters: list[str], all_containers: bool = False) -> list[dict[str, Any]]:
+    """Lists containers matching all of the given label filters, returning detailed info."""
+    containers = await get_containers(docker_client, label_filters, all_containers)
 
     return [container._container for container in containers]
 
 
-async def container_logs(docker_client: Docker, container_id: str) -> str:
-    """Retrieves logs for a specific container ID."""
-    logger.debug(f"Retrieving logs for container '{container_id}'...")
+@retry_on_stale_connection
+async def container_logs(docker_client: Docker, container_id: str, tail: int | None = None) -> str:
+    """Retrieves logs for a specific container ID.
+
+    Args:
+        docker_client: Docker client instance.
+        container_id: The ID of the container to retrieve logs for.
+        tail: Optional number of lines to return from the end of the logs. Trimming happens in the Docker daemon,
+            so long running containers don't ship their entire log history. Defaults to all lines.
+
+    """
+    logger.debug("Retrieving logs for container '%s'...", container_id)
 
     async with handle_errors("container logs"):
-        container = await docker_client.containers.get(container_id)
-        logs = await container.log(stdout=True, stderr=True)
+        # Build the handle locally rather than inspecting the container first, reading the logs inspects it itself
+        container = docker_client.containers.container(container_id)
+
+        # aiodocker decodes the frames incrementally, so multi-byte characters split between frames stay intact
+        logs = await container.log(stdout=True, stderr=True, tail="all" if tail is None else tail)
 
-    logger.debug(f"Retrieved logs for container '{container_id}'.")
+    logger.debug("Retrieved logs for container '%s'.", container_id)
 
     return "".join(logs)
 
@@ -165,28 +264,38 @@ async def container_logs(docker_client: Docker, container_id: str) -> str:
 
 # region Cleanup Container
 
+# Upper bound on container removals sent to the Docker daemon at once
+MAX_CONCURRENT_REMOVALS = 8
+
 
+@retry_on_stale_connection
 async def remove_container(docker_client: Docker, container_id: str) -> None:
     """Removes containers matching a label filter."""
-    logger.debug(f"Removing container '{container_id}'...")
+    logger.debug("Removing container '%s'...", container_id)
 
     async with handle_errors("container removal"):
-        container = await docker_client.containers.get(container_id)
-        await container.delete(force=True)
+        # Build the handle locally rather than inspecting the container first, the delete reports a missing container itself
+        await docker_client.containers.container(container_id).delete(force=True)
 
-    logger.debug(f"Removed container '{container_id}'.")
+    logger.debug("Removed container '%s'.", container_id)
 
 
-async def remove_containers(docker_client: Docker, label_filter: str) -> None:
-    """Removes containers matching a label filter."""
-    containers = await get_containers(docker_client, label_filter)
+async def remove_containers(docker_client: Docker, label_filters: list[str]) -> None:
+    """Removes containers matching all of the given label filters."""
+    containers = await get_containers(docker_client, label_filters)
+
+    logger.debug("Removing %d container(s) matching label filters %s...", len(containers), label_filters)
+
+    removal_slots = asyncio.Semaphore(MAX_CONCURRENT_REMOVALS)
 
-    logger.debug(f"Removing {len(containers)} container(s) matching label filter '{label_filter}'...")
+    async def remove(container: DockerContainer) -> None:
+        async with removal_slots:
+            await container.delete(force=True)
 
     async with handle_errors("container removal"):
-        [await container.delete(force=True) for container in containers]
+        await asyncio.gather(*(remove(container) for container in containers))
 
-    logger.debug(f"Removed {len(containers)} container(s) matching label filter '{label_filter}'.")
+    logger.debug("Removed %d container(s) matching label filters %s.", len(containers), label_filters)
 
 
 # endregion Cleanup Container
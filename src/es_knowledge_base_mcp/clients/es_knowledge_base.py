@@ -1,13 +1,15 @@
 """Elasticsearch client for managing and searching knowledge bases."""
 
 import asyncio
+import re
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Mapping
 from contextlib import asynccontextmanager
-from copy import deepcopy
 from datetime import UTC, datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
+from async_lru import alru_cache
 from elasticsearch import (
     ApiError,
     AsyncElasticsearch,
@@ -47,11 +49,38 @@ from es_knowledge_base_mcp.models.settings import KnowledgeBaseServerSettings
 if TYPE_CHECKING:
     from elastic_transport import ObjectApiResponse
 
-logger = get_logger("knowledge-base-mcp.elasticsearch")
+logger = get_logger("knowledge-base-mcp.knowledge-base")
 
-# endregion Index Handling
+# Character swaps applied when turning a URL into an index name, done in one pass instead of chained replaces
+INDEX_NAME_TRANSLATION = str.maketrans({".": "_", "/": ".", "-": "_"})
 
-logger = get_logger("knowledge-base-mcp.knowledge-base")
+# `\w` matches exactly what `str.isalnum()` accepts plus underscores, so this keeps alphanumerics, `_`, `-` and `.`
+INDEX_NAME_DISALLOWED_CHARACTERS = re.compile(r"[^\w.-]")
+
+# How long the knowledge base listing is reused before Elasticsearch is queried again, doc counts may lag by this much
+KNOWLEDGE_BASE_CACHE_TTL_SECONDS = 10
+
+# Only the parts of each multi-search response that are read when building search results
+MSEARCH_FILTER_PATH = [
+    "responses.status",
+    "responses.error",
+    "responses.hits.hits._id",
+    "responses.hits.hits._score",
+    "responses.hits.hits.highlight",
+    "responses.hits.hits.fields",
+    "responses.aggregations",
+]
+
+# Only the primary document count of each index, the same count `cat.indices` reports as `docs.count`
+DOC_COUNTS_FILTER_PATH = ["indices.*.primaries.docs.count"]
+
+# Only the parts of a recent documents response that are read when building documents
+RECENT_DOCUMENTS_FILTER_PATH = ["hits.hits._id", "hits.hits._score", "hits.hits.fields"]
+
+# Parts of the search request that do not depend on the phrase, shared across requests as they are only ever serialized
+SEARCH_SORT = [{"_score": {"order": "desc"}}]
+SEARCH_FIELDS = ["title", "url", "body", "knowledge_base_name"]
+SEARCH_AGGREGATIONS = {"by_kb_name": {"terms": {"field": "knowledge_base_name"}}}
 
 
 class ElasticsearchError(KnowledgeBaseError):
@@ -150,8 +179,7 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
             KnowledgeBaseError: For general knowledge base errors.
             ElasticsearchError: For any other unexpected errors.
         """
-        msg = f"Starting operation: {operation}"
-        logger.debug(msg)
+        logger.debug("Starting operation: %s", operation)
 
         try:
             yield
@@ -198,35 +226,29 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
             else:
                 raise KnowledgeBaseError(error_message) from e
 
-        msg = f"Operation {operation} completed successfully."
-        logger.debug(msg)
+        logger.debug("Operation %s completed successfully.", operation)
 
     # endregion Error Handling
 
     # region Get KBs
 
+    @alru_cache(maxsize=1, ttl=KNOWLEDGE_BASE_CACHE_TTL_SECONDS)
     async def get(self) -> list[KnowledgeBase]:
         """Get a list of all knowledge bases.
 
-        This requires querying the Elasticsearch indices and _cat to get doc counts.
+        This requires querying the Elasticsearch indices and _cat to get doc counts. The result is cached for a few seconds
+        as name lookups call this on nearly every tool call, changes made through this client clear the cache.
 
         Returns:
             list[KnowledgeBase]: A list of KnowledgeBase objects representing the knowledge bases found in Elasticsearch.
         """
-        async with self.error_handler("getting knowledge base indices"):
-            indices_get_response = await self.elasticsearch_client.indices.get_mapping(index=self.index_pattern, allow_no_indices=True)
+        # The two lookups are independent, so run them concurrently instead of paying for two sequential round-trips
+        kb_name_to_metadata, index_to_doc_counts = await asyncio.gather(self._get_metadata(), self._get_doc_counts())
 
-        if not indices_get_response.body or len(indices_get_response.body) == 0:
+        if not kb_name_to_metadata:
             logger.debug("No knowledge base indices found.")
             return []
 
-        kb_name_to_metadata: dict[str, dict[str, Any]] = {
-            index: metadata.get("mappings").get("_meta", {}).get("knowledge_base", {})
-            for index, metadata in indices_get_response.body.items()
-        }
-
-        index_to_doc_counts: dict[str, int] = await self._get_doc_counts()
-
         knowledge_bases = [
             KnowledgeBase(
                 name=metadata.get("name", "<Not Set>"),
@@ -241,25 +263,45 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
 
         return sorted(knowledge_bases, key=lambda kb: (kb.name.lower()))
 
+    async def _get_metadata(self) -> dict[str, dict[str, Any]]:
+        """Get the knowledge base metadata stored in the `_meta` mapping of each knowledge base index.
+
+        Returns:
+            dict[str, dict[str, Any]]: A dictionary where keys are index names and values are the knowledge base metadata.
+        """
+        async with self.error_handler("getting knowledge base indices"):
+            # Only the `_meta` section is used, so skip sending the field mappings back
+            indices_get_response = await self.elasticsearch_client.indices.get_mapping(
+                index=self.index_pattern, allow_no_indices=True, expand_wildcards="open", filter_path=["-*.mappings.properties"]
+            )
+
+        if not indices_get_response.body:
+            return {}
+
+        return {
+            index: metadata.get("mappings", {}).get("_meta", {}).get("knowledge_base", {})
+            for index, metadata in indices_get_response.body.items()
+        }
+
     async def _get_doc_counts(self) -> dict[str, int]:
         """Get document counts for a list of indices.
 
-        Uses the cat.indices API to retrieve document counts for the specified indices.
+        Uses the indices stats API, trimmed to the primary document counts, to retrieve document counts for the specified indices.
 
         Returns:
             dict[str, int]: A dictionary where keys are index names and values are document counts.
         """
         async with self.error_handler("getting document counts for indices"):
-            cat_response = await self.elasticsearch_client.options(ignore_status=404).cat.indices(
-                index=self.index_pattern, format="json", h=["index", "docs.count"]
+            stats_response = await self.elasticsearch_client.options(ignore_status=404).indices.stats(
+                index=self.index_pattern, metric="docs", expand_wildcards="open", filter_path=DOC_COUNTS_FILTER_PATH
             )
 
-        if not cat_response.body or not isinstance(cat_response.body, list):
+        if not stats_response.body or not isinstance(stats_response.body, dict):
             return {}
 
-        json_responses: list[dict[str, Any]] = cat_response.body
+        index_stats: dict[str, Any] = stats_response.body.get("indices", {})
 
-        return {item["index"]: int(item["docs.count"]) for item in json_responses}
+        return {index: stats["primaries"]["docs"]["count"] for index, stats in index_stats.items()}
 
     # endregion Get KBs
     # region Create / Update KBs
@@ -275,8 +317,9 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         Raises:
             KnowledgeBaseAlreadyExistsError: If a knowledge base with the same name already exists.
         """
-        current_kbs = await self.get()
-        if any(kb.name == knowledge_base_create_proto.name for kb in current_kbs):
+        # Only the names are needed to check for an existing knowledge base, so skip fetching the document counts.
+        current_metadata = await self._get_metadata()
+        if any(metadata.get("name") == knowledge_base_create_proto.name for metadata in current_metadata.values()):
             msg = f"Knowledge base with name '{knowledge_base_create_proto.name}' already exists."
             raise KnowledgeBaseAlreadyExistsError(msg)
 
@@ -286,15 +329,17 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
 
         index_name = f"{id_prefix}.{id_middle}-{id_suffix}"
 
-        index_mappings = deepcopy(x=CRAWLER_INDEX_MAPPING)
-
-        index_mappings = self._insert_metadata(index_mappings=index_mappings, knowledge_base_create_proto=knowledge_base_create_proto)
+        index_mappings = self._insert_metadata(
+            index_mappings=CRAWLER_INDEX_MAPPING, knowledge_base_create_proto=knowledge_base_create_proto
+        )
 
         index_mappings = self._insert_runtime_kb_name(index_mappings=index_mappings, kb_name=knowledge_base_create_proto.name)
 
-        async with self.error_handler(f"creating knowledge base index '{index_name}' and mappings {index_mappings}"):
+        async with self.error_handler(f"creating knowledge base index '{index_name}'"):
             await self.elasticsearch_client.indices.create(index=index_name, mappings=index_mappings)
 
+        self.get.cache_clear()
+
         return KnowledgeBase(
             name=knowledge_base_create_proto.name,
             type=knowledge_base_create_proto.type,
@@ -322,6 +367,8 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         async with self.error_handler(f"updating knowledge base metadata for '{index_name}'"):
             await self.elasticsearch_client.indices.put_mapping(index=index_name, **mapping_update)
 
+        self.get.cache_clear()
+
     # endregion Create / Update KBs
 
     # region Delete KBs
@@ -330,8 +377,11 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         async with self.error_handler(f"deleting knowledge base '{knowledge_base.backend_id}'"):
             await self.elasticsearch_client.indices.delete(index=knowledge_base.backend_id)
 
+        self.get.cache_clear()
+
     # endregion Delete KBs
 
+    # region Search KBs
     async def search(self, phrases: list[str], results: int = 5, fragments: int = 5) -> list[KnowledgeBaseSearchResultTypes]:
         """Search within a specific knowledge base.
 
@@ -373,36 +423,36 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
                 index=index_name,
                 query={"match_all": {}},
                 fields=["title", "url", "body"],  # type: ignore
+                source=False,
                 size=results,
                 sort=[{"@timestamp": {"order": "desc"}}],
+                filter_path=RECENT_DOCUMENTS_FILTER_PATH,
             )
 
-        if not search_response or not search_response.body or "hits" not in search_response.body:
-            msg = f"No recent documents found in knowledge base '{knowledge_base.name}' ({index_name})."
-            logger.warning(msg)
-            return []
+        # filter_path drops the empty hits array, leaving an empty (and falsy) response for an index with no documents
+        hits = search_response.body.get("hits", {}).get("hits", [])
 
-        return [self._hit_to_document(hit=hit) for hit in search_response.body["hits"].get("hits", [])]
+        return [self._hit_to_document(hit=hit) for hit in hits]
 
     @classmethod
-    def _phrase_to_query(cls, phrase: str, knowledge_base_names: list[str], size: int = 5, fragments: int = 5) -> dict[str, Any]:
+    def _phrase_to_query(cls, phrase: str, knowledge_base_filter: dict[str, Any], size: int = 5, fragments: int = 5) -> dict[str, Any]:
         """Convert phrase to queries.
 
         Returns:
             dict[str, Any]: The Elasticsearch query dictionary.
         """
-        knowledge_base_match = {"terms": {"knowledge_base_name": knowledge_base_names}} if knowledge_base_names else {"match_all": {}}
         heading_match = {"match": {"headings": {"query": phrase, "boost": 1}}}
         semantic_match = {"semantic": {"field": "body", "query": phrase, "boost": 5}}
 
         return {
-            "query": {"bool": {"filter": knowledge_base_match, "should": [heading_match, semantic_match]}},
+            "query": {"bool": {"filter": knowledge_base_filter, "should": [heading_match, semantic_match]}},
             "min_score": 10,
-            "sort": [{"_score": {"order": "desc"}}],
+            "sort": SEARCH_SORT,
             "size": size,
             "highlight": {"number_of_fragments": fragments, "fragment_size": 500, "fields": {"body": {}}},
-            "fields": ["title", "url", "body", "knowledge_base_name"],
-            "aggs": {"by_kb_name": {"terms": {"field": "knowledge_base_name"}}},
+            "_source": False,
+            "fields": SEARCH_FIELDS,
+            "aggs": SEARCH_AGGREGATIONS,
         }
 
     async def _search_by_knowledge_base_names(
@@ -413,21 +463,34 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         Returns:
             list[KnowledgeBaseSearchResultTypes]: A list of search results containing the phrase, results, and summaries.
         """
-        operations = []
+        # Blank phrases can't match anything, and an empty multi-search is rejected by Elasticsearch, so skip the round-trip
+        phrases = [phrase for phrase in phrases if phrase.strip()]
 
-        for phrase in phrases:
-            operations.extend(
-                (
-                    {"index": self.index_pattern},
-                    self._phrase_to_query(phrase, knowledge_base_names=knowledge_base_names, size=results, fragments=fragments),
-                )
+        if not phrases:
+            return []
+
+        # The knowledge base filter is the same for every phrase, so build it once per search
+        knowledge_base_filter = {"terms": {"knowledge_base_name": knowledge_base_names}} if knowledge_base_names else {"match_all": {}}
+
+        search_header = {"index": self.index_pattern, "request_cache": True}
+
+        # Each search is a header line followed by its body, the header is shared as it is only serialized
+        operations = [
+            operation
+            for phrase in phrases
+            for operation in (
+                search_header,
+                self._phrase_to_query(phrase, knowledge_base_filter=knowledge_base_filter, size=results, fragments=fragments),
             )
+        ]
 
         msearch_results: ObjectApiResponse | None = None
 
         for i in range(3):
             async with self.error_handler("multi-search operation"):
-                msearch_results = await self.elasticsearch_client.options(retry_on_timeout=True).msearch(searches=operations)
+                msearch_results = await self.elasticsearch_client.options(retry_on_timeout=True).msearch(
+                    searches=operations, filter_path=MSEARCH_FILTER_PATH
+                )
 
             if not msearch_results or "responses" not in msearch_results:
                 msg = f"No results returned from multi-search operation {msearch_results}. Retrying... ({i + 1}/3)"
@@ -453,32 +516,23 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
 
         search_results: list[KnowledgeBaseSearchResultTypes] = []
 
-        for i, response in enumerate(msearch_results["responses"]):
-            phrase = phrases[i]
+        for phrase, response in zip(phrases, msearch_results["responses"], strict=False):
+            hits: list[dict[str, Any]] = response.get("hits", {}).get("hits")
 
-            if not response.get("hits", {}).get("hits"):
+            if not hits:
                 error_message = f"No hits found in one of the search responses. {response}"
                 search_results.append(KnowledgeBaseSearchResultError(phrase=phrase, error=error_message))
                 logger.warning(error_message)
                 continue
 
-            summaries: list[PerKnowledgeBaseSummary] = [
-                PerKnowledgeBaseSummary(
-                    knowledge_base_name=bucket["key"],
-                    matches=bucket["doc_count"],
-                )
-                for bucket in response["aggregations"]["by_kb_name"]["buckets"]
-            ]
-
-            phrase_results: list[KnowledgeBaseDocument] = [
-                self._hit_to_document(hit=hit) for hit in response.get("hits", {}).get("hits", [])
-            ]
-
             search_results.append(
                 KnowledgeBaseSearchResult(
                     phrase=phrase,
-                    results=phrase_results,
-                    summaries=summaries,
+                    results=[self._hit_to_document(hit=hit) for hit in hits],
+                    summaries=[
+                        PerKnowledgeBaseSummary(knowledge_base_name=bucket["key"], matches=bucket["doc_count"])
+                        for bucket in response["aggregations"]["by_kb_name"]["buckets"]
+                    ],
                 )
             )
 
@@ -497,15 +551,16 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
 
         score = hit.get("_score", 0.0)
 
-        fields = hit.get("fields", {})
+        # Bound once, as every field is looked up through it for each hit
+        get_field = hit.get("fields", {}).get
 
-        knowledge_base_name = next(iter(fields.get("knowledge_base_name", [])), "<Unknown KB>")
+        knowledge_base_name = next(iter(get_field("knowledge_base_name", [])), "<Unknown KB>")
 
-        content = highlights or fields.get("body")
+        content = highlights or get_field("body")
 
-        title: str = next(iter(fields.get("title", ["<No Title>"])))
+        title: str = next(iter(get_field("title", ["<No Title>"])))
 
-        url: str = next(iter(fields.get("url", [None])))
+        url: str = next(iter(get_field("url", [None])))
 
         return KnowledgeBaseDocument(
             id=doc_id,
@@ -528,17 +583,16 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
             KnowledgeBaseError: If there is an error inserting documents.
         """
         index_name = knowledge_base.backend_id
-        operations = []
 
         now = round(datetime.now(tz=UTC).timestamp() * 1000)
 
-        for document_proto in documents:
-            operations.extend(
-                (
-                    {"index": {"_index": index_name}},
-                    {"@timestamp": now, "title": document_proto.title, "body": document_proto.content},
-                )
-            )
+        index_action = {"index": {"_index": index_name}}
+
+        operations = [
+            operation
+            for document_proto in documents
+            for operation in (index_action, {"@timestamp": now, "title": document_proto.title, "body": document_proto.content})
+        ]
 
         if not operations:
             msg = f"Requested to insert documents into knowledge base '{knowledge_base.name}', but no documents provided."
@@ -548,6 +602,8 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         async with self.error_handler(f"inserting documents into knowledge base '{knowledge_base.name} ({index_name})'"):
             result = await self.elasticsearch_client.bulk(operations=operations)
 
+        self.get.cache_clear()
+
         if result and result.get("errors", False):
             error_message = (
                 f"Failed to insert documents into knowledge base '{knowledge_base.name} ({index_name})': {result.get('items', [])}"
@@ -574,9 +630,12 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         async with self.error_handler(f"deleting document {document_id} from knowledge base '{knowledge_base.name} ({index_name})'"):
             await self.elasticsearch_client.delete(index=index_name, id=document_id)
 
+        self.get.cache_clear()
+
     # endregion Delete Documents
 
     @classmethod
+    @lru_cache(maxsize=512)
     def _url_to_index_name(cls, url: str) -> str:
         """Convert URL to a valid Elasticsearch index name.
 
@@ -591,14 +650,14 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         # so we replace dots with underscores
         # slashes with dots
         # strip all other characters
-        new_index_name = url.replace("https://", "").replace("http://", "").replace(".", "_").replace("/", ".").replace("-", "_")
-        new_index_name = "".join(c for c in new_index_name if c.isalnum() or c in {"_", "-", "."})
+        new_index_name = url.replace("https://", "").replace("http://", "").translate(INDEX_NAME_TRANSLATION)
+        new_index_name = INDEX_NAME_DISALLOWED_CHARACTERS.sub("", new_index_name)
         # trim off any leading or trailing dashes, underscores, or periods
 
         return new_index_name[:50].strip("-_.").lower()
 
     @classmethod
-    def _insert_runtime_kb_name(cls, index_mappings: dict[str, Any], kb_name: str) -> dict[str, Any]:
+    def _insert_runtime_kb_name(cls, index_mappings: Mapping[str, Any], kb_name: str) -> dict[str, Any]:
         """Insert a runtime mapping value into the given mapping.
 
         Returns:
@@ -618,7 +677,7 @@ class ElasticsearchKnowledgeBaseClient(KnowledgeBaseClient):
         }
 
     @classmethod
-    def _insert_metadata(cls, index_mappings: dict[str, Any], knowledge_base_create_proto: KnowledgeBaseCreateProto) -> dict[str, Any]:
+    def _insert_metadata(cls, index_mappings: Mapping[str, Any], knowledge_base_create_proto: KnowledgeBaseCreateProto) -> dict[str, Any]:
         """Build the Elasticsearch _meta mapping from a KnowledgeBaseCreateProto.
 
         Returns:
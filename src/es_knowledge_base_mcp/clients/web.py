@@ -1,5 +1,6 @@
 """Utility functions for web-related operations."""
 
+import asyncio
 from typing import Any
 from urllib.parse import urljoin, urlparse, urlunparse
 
@@ -34,7 +35,8 @@ async def extract_urls_from_webpage(url: str, domain_filter: str | None = None,
         ["http://example.com/page1", "http://example.com/page2"]
 
     """
-    response = requests.get(url, timeout=10)
+    # requests is synchronous, run it in a worker thread so the event loop can keep serving other tool calls
+    response = await asyncio.to_thread(requests.get, url, timeout=10)
     response.raise_for_status()
     soup = BeautifulSoup(response.content, "html.parser")
 
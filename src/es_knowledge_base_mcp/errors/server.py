@@ -15,7 +15,7 @@ class KnowledgeBaseMCPBaseError(Exception):
         """Return a user-friendly string representation."""
         cause = self.__cause__
         if cause:
-            self.msg += f": {cause}"
+            return f"{self.msg}: {cause}"
         return self.msg
 
 
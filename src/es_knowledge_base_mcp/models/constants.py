@@ -1,5 +1,7 @@
 """Constants used across the knowledge base MCP."""
 
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 BASE_LOGGER_NAME = "knowledge-base-mcp"
@@ -10,23 +12,29 @@ SEMANTIC_TEXT_MAPPING: dict[str, Any] = {
     "model_settings": {"service": "elasticsearch", "task_type": "sparse_embedding"},
 }
 
-CRAWLER_INDEX_MAPPING: dict[str, Any] = {
-    "properties": {
-        "@timestamp": {"type": "date"},
-        "body": SEMANTIC_TEXT_MAPPING,
-        "headings": SEMANTIC_TEXT_MAPPING,
-        "id": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "last_crawled_at": {"type": "date"},
-        "links": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "meta_keywords": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "title": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_host": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_path": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_path_dir1": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_path_dir2": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_path_dir3": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
-        "url_port": {"type": "long"},
-        "url_scheme": {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
+# Text field with a keyword sub-field, one object shared by every such field in the crawler mapping
+KEYWORD_TEXT_MAPPING: dict[str, Any] = {"type": "text", "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}}
+
+# Frozen so it can be shared across index creations without copying, build new mappings with `|` instead of mutating it
+CRAWLER_INDEX_MAPPING: Mapping[str, Any] = MappingProxyType(
+    {
+        "properties": {
+            "@timestamp": {"type": "date"},
+            "body": SEMANTIC_TEXT_MAPPING,
+            "headings": SEMANTIC_TEXT_MAPPING,
+            "id": KEYWORD_TEXT_MAPPING,
+            "last_crawled_at": {"type": "date"},
+            "links": KEYWORD_TEXT_MAPPING,
+            "meta_keywords": KEYWORD_TEXT_MAPPING,
+            "title": KEYWORD_TEXT_MAPPING,
+            "url": KEYWORD_TEXT_MAPPING,
+            "url_host": KEYWORD_TEXT_MAPPING,
+            "url_path": KEYWORD_TEXT_MAPPING,
+            "url_path_dir1": KEYWORD_TEXT_MAPPING,
+            "url_path_dir2": KEYWORD_TEXT_MAPPING,
+            "url_path_dir3": KEYWORD_TEXT_MAPPING,
+            "url_port": {"type": "long"},
+            "url_scheme": KEYWORD_TEXT_MAPPING,
+        }
     }
-}
+)
@@ -2,16 +2,38 @@
 
 import logging
 import os
-from typing import Any, Literal, Self
+from functools import cached_property
+from typing import Any, ClassVar, Literal, Self
 
+from elasticsearch.serializer import NdjsonSerializer
 from pydantic import Field, SecretStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+try:
+    from elasticsearch.serializer import OrjsonSerializer
+except ImportError:  # orjson is optional, fall back to the client's default stdlib json serializers
+    OrjsonSerializer = None
+
 from es_knowledge_base_mcp.errors.server import InvalidSettingError
 from es_knowledge_base_mcp.models.constants import BASE_LOGGER_NAME
 
 logger = logging.getLogger(BASE_LOGGER_NAME)
 
+# Serializers replacing the client defaults when orjson is installed, covering the NDJSON msearch and bulk bodies as well as JSON
+ELASTICSEARCH_SERIALIZERS: dict[str, Any] = {}
+
+if OrjsonSerializer is not None:
+
+    class OrjsonNdjsonSerializer(OrjsonSerializer, NdjsonSerializer):
+        """Newline delimited JSON serializer that encodes and decodes each line with orjson."""
+
+        mimetype: ClassVar[str] = NdjsonSerializer.mimetype
+
+    ELASTICSEARCH_SERIALIZERS = {
+        OrjsonSerializer.mimetype: OrjsonSerializer(),
+        OrjsonNdjsonSerializer.mimetype: OrjsonNdjsonSerializer(),
+    }
+
 ELASTICSEARCH_ENV_PREFIX = "ES_"
 
 # region Transport Settings
@@ -85,6 +107,18 @@ class ElasticsearchSettings(BaseElasticsearchSettings):
         description="Request timeout for Elasticsearch operations in seconds.",
     )
 
+    connections_per_node: int = Field(
+        default=32,
+        alias="es_connections_per_node",
+        description="Maximum number of pooled keep-alive connections to each Elasticsearch node.",
+    )
+
+    http_compress: bool = Field(
+        default=True,
+        alias="es_http_compress",
+        description="Gzip request bodies and accept gzip responses. Disabling can help when Elasticsearch is on the local network.",
+    )
+
     bulk_api_max_items: int = Field(
         default=200,
         alias="es_bulk_api_max_items",
@@ -113,8 +147,9 @@ class ElasticsearchSettings(BaseElasticsearchSettings):
             raise InvalidSettingError(setting="es_password", error="Password requires a username.")
         return self
 
-    def _get_auth_dict(self) -> dict[str, Any]:
-        """Get the authentication dictionary for Elasticsearch."""
+    @cached_property
+    def _auth_dict(self) -> dict[str, Any]:
+        """Get the authentication dictionary for Elasticsearch, secrets are only unwrapped the first time it is requested."""
         auth_dict = {}
 
         if self.api_key:
@@ -133,11 +168,13 @@ class ElasticsearchSettings(BaseElasticsearchSettings):
         return {
             "hosts": [self.host],
             "request_timeout": self.request_timeout,
-            "http_compress": True,
+            "connections_per_node": self.connections_per_node,
+            "http_compress": self.http_compress,
             "retry_on_status": (408, 429, 502, 503, 504),
             "retry_on_timeout": True,
             "max_retries": 5,
-            **self._get_auth_dict(),
+            **({"serializers": ELASTICSEARCH_SERIALIZERS} if ELASTICSEARCH_SERIALIZERS else {}),
+            **self._auth_dict,
         }
 
     def to_crawler_settings(self) -> dict[str, Any]:
@@ -148,16 +185,18 @@ class ElasticsearchSettings(BaseElasticsearchSettings):
                 "max_items": self.bulk_api_max_items,
                 "max_size_bytes": self.bulk_api_max_size_bytes,
             },
-            **self._get_auth_dict(),
+            **self._auth_dict,
         }
 
 
 class KnowledgeBaseServerSettings(BaseElasticsearchSettings):
+    # An empty prefix would leave `base_index_pattern` as a bare `-*` expression instead of a scoped wildcard
     base_index_prefix: str = Field(
         default="kbmcp",
+        min_length=1,
     )
 
-    @property
+    @cached_property
     def base_index_pattern(self) -> str:
         """Generate the Elasticsearch index name using the prefix and a wildcard."""
         return f"{self.base_index_prefix}-*"
@@ -182,7 +221,7 @@ class MemoryServerSettings(BaseElasticsearchSettings):
         description="Project name for the memory server.",
     )
 
-    @property
+    @cached_property
     def memory_index_pattern(self) -> str:
         return f"{self.memory_index_prefix}*"
 
@@ -200,12 +239,25 @@ class CrawlerSettings(BaseSettings):
 
     docker_image: str = Field(alias="crawler_docker_image", default="ghcr.io/strawgate/es-crawler:main")
 
+    pull_policy: Literal["always", "if-not-present"] = Field(
+        default="if-not-present",
+        alias="crawler_pull_policy",
+        description="Whether to pull the crawler image on startup even when it is already present locally.",
+    )
+
     docker_socket: str | None = Field(
         default=None,
         alias="crawler_docker_socket",
         description="Docker socket for the crawler.",
     )
 
+    max_concurrent_starts: int = Field(
+        default=8,
+        alias="crawler_max_concurrent_starts",
+        gt=0,
+        description="Maximum number of crawl containers being created and started in the Docker daemon at once.",
+    )
+
 
 # endregion Elasticsearch Settings
 
@@ -25,7 +25,9 @@ from es_knowledge_base_mcp.servers.manage import ManageServer
 from es_knowledge_base_mcp.servers.remember import MemoryServer
 
 logger: Logger = get_logger(name=BASE_LOGGER_NAME)
-logger.setLevel(level="DEBUG")
+
+# Tool results are dumped as JSON-compatible data, so the safe dumper never emits class tags. Prefer the libyaml backed one.
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def arg_parsing() -> None:
@@ -78,7 +80,7 @@ def yaml_serializer(obj: Any) -> str:
         ValueError: If the object is not a Pydantic model or cannot be serialized.
     """
     if isinstance(obj, BaseModel):
-        return yaml.dump(obj.model_dump(), default_flow_style=False, width=10000, sort_keys=False)
+        return yaml.dump(obj.model_dump(mode="json"), Dumper=YAML_DUMPER, default_flow_style=False, width=10000, sort_keys=False)
     error_message = f"Object of type {type(obj)} is not serializable to YAML"
     raise ValueError(error_message)
 
@@ -93,18 +95,20 @@ async def root_lifespan(_: FastMCP) -> AsyncGenerator[RootContext, None]:
     yield RootContext()
 
 
+@asynccontextmanager
 async def setup_learn_server(
     server: FastMCP,
     knowledge_base_client: ElasticsearchKnowledgeBaseClient,
     crawler_settings: CrawlerSettings,
     elasticsearch_settings: ElasticsearchSettings,
-) -> FastMCP:
+) -> AsyncGenerator[FastMCP, None]:
     """Set up the Learn Server with the provided FastMCP server.
 
     This function registers the LearnServer with the given FastMCP instance,
     allowing it to handle learning operations within the MCP framework.
+    The crawler's Docker client stays open until the context exits.
 
-    Returns:
+    Yields:
         FastMCP: The configured LearnServer instance.
     """
     learn_mcp = FastMCP(name="learn-mcp", tool_serializer=yaml_serializer)
@@ -115,13 +119,12 @@ async def setup_learn_server(
         elasticsearch_settings=elasticsearch_settings,
     )
 
-    await learn_server.crawler.async_init()
-
-    learn_server.register_tools(mcp_server=learn_mcp)
+    async with LearnServer.connection_context_manager(learn_server):
+        learn_server.register_tools(mcp_server=learn_mcp)
 
-    server.mount(prefix="learn", server=learn_mcp)
+        server.mount(prefix="learn", server=learn_mcp)
 
-    return learn_mcp
+        yield learn_mcp
 
 
 def setup_manage_server(server: FastMCP, knowledge_base_client: ElasticsearchKnowledgeBaseClient) -> FastMCP:
@@ -202,6 +205,9 @@ async def main() -> None:
 
     settings.logging.configure_logging()
 
+    # Set here rather than at import, so importing the package leaves the host application's logging alone
+    logger.setLevel(level=settings.logging.log_level)
+
     elasticsearch_client_args = settings.elasticsearch.to_client_settings()
     elasticsearch_client = AsyncElasticsearch(**elasticsearch_client_args)
 
@@ -209,37 +215,34 @@ async def main() -> None:
         error_message = "Elasticsearch client failed to ping. Please check your Elasticsearch configuration."
         raise ConfigurationError(error_message)
 
-    # monkey patch so our yaml emitter doesnt include class names in output
-    yaml.emitter.Emitter.prepare_tag = lambda self, tag: ""  # noqa: ARG005
-
     async with ElasticsearchKnowledgeBaseClient.connection_context_manager(elasticsearch_client) as handled_elasticsearch_client:
         knowledge_base_client = ElasticsearchKnowledgeBaseClient(
             settings=settings.knowledge_base,
             elasticsearch_client=handled_elasticsearch_client,
         )
 
-    # Begin initializing MCP Servers
-    root_mcp = FastMCP(name="knowledge-base-mcp", lifespan=root_lifespan, tool_serializer=yaml_serializer)
-
-    setup_manage_server(server=root_mcp, knowledge_base_client=knowledge_base_client)
+        # The client stays open for the lifetime of the server and is closed when the context exits
+        # Begin initializing MCP Servers
+        root_mcp = FastMCP(name="knowledge-base-mcp", lifespan=root_lifespan, tool_serializer=yaml_serializer)
 
-    setup_memory_server(server=root_mcp, memory_server_settings=settings.memory, knowledge_base_client=knowledge_base_client)
+        setup_manage_server(server=root_mcp, knowledge_base_client=knowledge_base_client)
 
-    setup_ask_server(server=root_mcp, knowledge_base_client=knowledge_base_client)
+        setup_memory_server(server=root_mcp, memory_server_settings=settings.memory, knowledge_base_client=knowledge_base_client)
 
-    await setup_learn_server(
-        server=root_mcp,
-        knowledge_base_client=knowledge_base_client,
-        crawler_settings=settings.crawler,
-        elasticsearch_settings=settings.elasticsearch,
-    )
+        setup_ask_server(server=root_mcp, knowledge_base_client=knowledge_base_client)
 
-    bulk_tool_caller = BulkToolCaller()
+        async with setup_learn_server(
+            server=root_mcp,
+            knowledge_base_client=knowledge_base_client,
+            crawler_settings=settings.crawler,
+            elasticsearch_settings=settings.elasticsearch,
+        ):
+            bulk_tool_caller = BulkToolCaller()
 
-    bulk_tool_caller.register_tools(root_mcp)
+            bulk_tool_caller.register_tools(root_mcp)
 
-    logger.info("All MCP servers initialized successfully.")
-    await root_mcp.run_async(transport=settings.mcps.mcp_transport)
+            logger.info("All MCP servers initialized successfully.")
+            await root_mcp.run_async(transport=settings.mcps.mcp_transport)
 
 
 def run() -> None:
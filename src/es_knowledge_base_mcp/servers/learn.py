@@ -1,7 +1,8 @@
 """MCP Server for the Learn MCP Server."""
 
+import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
 from fastmcp.contrib.mcp_mixin import MCPMixin, mcp_tool
@@ -31,6 +32,9 @@ URL_FIELD = Field(description="The URL of the webpage to extract URLs from.")
 LEARN_WEB_DOCUMENTATION_PROTO_FIELD = Field(
     description="The LearnWebDocumentationProto object containing the parameters for learning from web documentation.",
 )
+LEARN_WEB_DOCUMENTATION_PROTOS_FIELD = Field(
+    description="The LearnWebDocumentationProto objects, one for each web documentation source to learn from.",
+)
 MAX_CHILD_PAGE_LIMIT_FIELD = Field(default=500, description="The maximum allowed number of child pages to crawl.")
 
 
@@ -120,12 +124,24 @@ class LearnServer(MCPMixin):
         Yields:
             LearnServer: An instance of LearnServer with an active crawler connection.
         """
+        await learn_server.crawler.async_init()
+
         try:
-            await learn_server.crawler.async_init()
             yield learn_server
         finally:
             await learn_server.crawler.async_shutdown()
 
+    @staticmethod
+    async def _discard_task(task: asyncio.Task[Any]) -> None:
+        """Cancel a task whose result is no longer needed, and wait for it to finish.
+
+        The task may have already failed, so its exception is retrieved here rather than reported as never retrieved.
+        """
+        task.cancel()
+
+        with suppress(Exception, asyncio.CancelledError):
+            await task
+
     # endregion Error Handling
 
     # region Tools
@@ -172,14 +188,20 @@ class LearnServer(MCPMixin):
         overwrite = learn_web_documentation_proto.overwrite
         exclude_paths = learn_web_documentation_proto.exclude_paths
 
+        # Look up the knowledge base while the seed page is fetched and validated, the two are independent
+        existing_knowledge_base = asyncio.create_task(self.knowledge_base_client.try_get_by_name(learn_web_documentation_proto.name))
+
         try:
             crawl_parameters: dict[str, Any] = await Crawler.validate_crawl(url, max_child_page_limit)
         except CrawlerValidationError as e:
-            msg = f"Validation failed for URL {url}: {e}"
-            logger.exception(msg)
+            await self._discard_task(existing_knowledge_base)
+            logger.exception("Validation failed for URL %s", url)
             return CrawlStartFailure(url=url, reason=str(e))
+        except BaseException:
+            await self._discard_task(existing_knowledge_base)
+            raise
 
-        target_knowledge_base: KnowledgeBase | None = await self.knowledge_base_client.try_get_by_name(learn_web_documentation_proto.name)
+        target_knowledge_base: KnowledgeBase | None = await existing_knowledge_base
 
         if target_knowledge_base and not overwrite:
             message = f"Knowledge base with name '{learn_web_documentation_proto.name}' already exists. Use 'overwrite' to update it."
@@ -205,15 +227,49 @@ class LearnServer(MCPMixin):
                 elasticsearch_index_name=index_name, exclude_paths=exclude_paths, **crawl_parameters
             )
         except CrawlerError as e:
-            msg = f"Failed to start crawl for {url}: {e}"
-            logger.exception(msg)
+            logger.exception("Failed to start crawl for %s", url)
             return CrawlStartFailure(url=url, reason=str(e))
 
-        msg = f"Successfully started crawl for {url} with container ID {container_id}."
-        logger.info(msg)
+        logger.info("Successfully started crawl for %s with container ID %s.", url, container_id)
 
         return CrawlStartSuccess(url=url, knowledge_base_id=index_name, container_id=container_id)
 
+    @mcp_tool()
+    async def from_many_web_documentation(
+        self,
+        learn_web_documentation_protos: list[LearnWebDocumentationProto] = LEARN_WEB_DOCUMENTATION_PROTOS_FIELD,
+        max_child_page_limit: int = MAX_CHILD_PAGE_LIMIT_FIELD,
+    ) -> list[CrawlResult]:
+        """Start several crawl jobs at once, validating and starting each of them concurrently.
+
+        Knowledge base names must be unique within the request, only the first crawl for a repeated name is started.
+
+        Returns:
+            A CrawlStartSuccess or CrawlStartFailure object for each requested crawl, in the order they were requested.
+        """
+        # Crawls sharing a name would each find no knowledge base and create their own, leaving the name ambiguous
+        first_index_by_name: dict[str, int] = {}
+        for index, proto in enumerate(learn_web_documentation_protos):
+            first_index_by_name.setdefault(proto.name, index)
+
+        async def start_crawl(index: int, proto: LearnWebDocumentationProto) -> CrawlResult:
+            if first_index_by_name[proto.name] != index:
+                message = f"Knowledge base name '{proto.name}' is requested more than once, only its first crawl is started."
+                logger.error(message)
+                return CrawlStartFailure(url=proto.data_source, reason=message)
+
+            return await self.from_web_documentation(learn_web_documentation_proto=proto, max_child_page_limit=max_child_page_limit)
+
+        results = await asyncio.gather(
+            *(start_crawl(index, proto) for index, proto in enumerate(learn_web_documentation_protos)),
+            return_exceptions=True,
+        )
+
+        return [
+            CrawlStartFailure(url=proto.data_source, reason=str(result)) if isinstance(result, BaseException) else result
+            for proto, result in zip(learn_web_documentation_protos, results, strict=True)
+        ]
+
     @mcp_tool()
     async def active_documentation_requests(self) -> list[dict[str, Any]]:
         """List of active documentation requests.
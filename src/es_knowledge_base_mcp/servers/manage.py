@@ -15,9 +15,6 @@ from es_knowledge_base_mcp.models.constants import BASE_LOGGER_NAME
 logger = get_logger(BASE_LOGGER_NAME).getChild("manage")
 
 
-logger = get_logger(BASE_LOGGER_NAME).getChild("manage")
-
-
 MANAGE_RESOURCE_PREFIX = "kb://"
 
 BACKEND_ID_FIELD = Field(description="The backend ID of the knowledge base.")
@@ -109,8 +109,7 @@ class MemoryServer(MCPMixin):
             MemoryInitResponse: A response containing the project name, memory backend ID, memory count, and optionally recent memories.
         """
         if memory_knowledge_base := await self.knowledge_base_client.try_get_by_name(project_name):
-            debug_msg = f"Using existing memory knowledge base: {memory_knowledge_base.name}"
-            logger.debug(debug_msg)
+            logger.debug("Using existing memory knowledge base: %s", memory_knowledge_base.name)
             self.memory_knowledge_base = memory_knowledge_base
         else:
             knowledge_base_create_proto = KnowledgeBaseCreateProto(
@@ -124,8 +123,7 @@ class MemoryServer(MCPMixin):
                 knowledge_base_create_proto=knowledge_base_create_proto,
             )
 
-        debug_msg = f"Project name set to: {project_name} using KB: {memory_knowledge_base.backend_id}"
-        logger.debug(debug_msg)
+        logger.debug("Project name set to: %s using KB: %s", project_name, memory_knowledge_base.backend_id)
 
         context.request_context.lifespan_context.memory_context.project_name = project_name
         context.request_context.lifespan_context.memory_context.knowledge_base = memory_knowledge_base
@@ -1,4 +1,5 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from requests import HTTPError
@@ -47,12 +48,21 @@ from es_knowledge_base_mcp.errors.crawler import (
                 "filter_pattern": "/",
             },
         ),
+        (
+            "http://a.com/doc;jsessionid=1",
+            {
+                "seed_url": "http://a.com/doc;jsessionid=1",
+                "domain": "http://a.com",
+                "filter_pattern": "/doc",
+            },
+        ),
     ],
     ids=[
         "URL with file extension",
         "URL with trailing slash",
         "Root URL",
         "Root URL with file extension",
+        "URL with path parameters",
     ],
 )
 def test_derive_crawl_params(url, expected_params):
@@ -129,7 +139,6 @@ async def test_validate_crawl(mock_extract_urls, mock_extract_return, expected_e
     )
 
 
-@pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("domain", "seed_url", "filter_pattern", "index_name", "es_settings"),
     [
@@ -155,7 +164,7 @@ async def test_validate_crawl(mock_extract_urls, mock_extract_return, expected_e
         "https_ssl",
     ],
 )
-async def test__prepare_crawl_config_file(
+def test__prepare_crawl_config_file(
     snapshot,
     domain: str,
     seed_url: str,
@@ -164,7 +173,45 @@ async def test__prepare_crawl_config_file(
     es_settings: dict,
 ):
     """Tests _prepare_crawl_config_file using parametrization and snapshot testing."""
-    inject_file = await Crawler._prepare_crawl_config_file(domain, seed_url, filter_pattern, index_name, es_settings)
+    inject_file = Crawler._prepare_crawl_config_file(domain, seed_url, filter_pattern, index_name, es_settings)
 
     assert isinstance(inject_file, InjectFile)
     assert inject_file == snapshot
+
+
+@pytest.mark.asyncio
+async def test_ensure_crawler_image_cancelled_waiter_keeps_shared_pull():
+    """Tests that cancelling one crawl waiting on the image pull neither cancels the pull nor the other waiters."""
+    crawler = Crawler(settings=MagicMock(max_concurrent_starts=1), elasticsearch_settings=MagicMock())
+    pull_released = asyncio.Event()
+
+    async def pull_crawler_image() -> None:
+        await pull_released.wait()
+
+    with patch.object(crawler, "pull_crawler_image", side_effect=pull_crawler_image):
+        cancelled_waiter = asyncio.create_task(crawler.ensure_crawler_image())
+        other_waiter = asyncio.create_task(crawler.ensure_crawler_image())
+        await asyncio.sleep(0)
+
+        cancelled_waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled_waiter
+
+        pull_released.set()
+        await other_waiter
+
+    assert crawler.image_pull_task is not None
+    assert not crawler.image_pull_task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_background_image_pull_failure_is_logged(caplog):
+    """Tests that a failed background pull is logged even if no crawl ever waits for it."""
+    crawler = Crawler(settings=MagicMock(max_concurrent_starts=1), elasticsearch_settings=MagicMock())
+
+    with patch.object(crawler, "pull_crawler_image", AsyncMock(side_effect=RuntimeError("registry unreachable"))):
+        pull_task = crawler._start_image_pull()
+        await asyncio.wait([pull_task])
+        await asyncio.sleep(0)
+
+    assert "Background pull of the crawler image failed" in caplog.text
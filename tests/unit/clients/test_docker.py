@@ -1,8 +1,22 @@
+import asyncio
+import struct
 import tarfile
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from aiodocker.containers import DockerContainer
+from aiodocker.exceptions import DockerError
 
-from es_knowledge_base_mcp.clients.docker import InjectFile
+from es_knowledge_base_mcp.clients.docker import (
+    MAX_CONCURRENT_REMOVALS,
+    InjectFile,
+    container_logs,
+    files_to_tar_stream,
+    image_exists,
+    remove_containers,
+    retry_on_stale_connection,
+)
 
 
 @pytest.mark.parametrize(
@@ -36,3 +50,157 @@ def test_inject_file_to_tar_stream(filename: str, content: str, expected_filenam
         assert extracted_file is not None, "Failed to extract file from tar"
         extracted_content = extracted_file.read().decode("utf-8")
         assert extracted_content == content, f"Expected file content to be '{content}' but got '{extracted_content}'"
+
+
+def test_inject_file_bytes_content():
+    """Tests that byte content is written to the tar archive as is."""
+    content = "caf\u00e9: \u2615".encode()
+    tar_stream = InjectFile(filename="/config/file.yml", content=content).to_tar_stream()
+
+    with tarfile.open(fileobj=tar_stream, mode="r") as tar:
+        extracted_file = tar.extractfile("config/file.yml")
+        assert extracted_file is not None
+        assert extracted_file.read() == content
+
+
+def test_files_to_tar_stream():
+    """Tests that files_to_tar_stream packs every file into a single archive."""
+    files = [
+        InjectFile(filename="/config/crawl.yml", content="key: value"),
+        InjectFile(filename="/config/other.yml", content="other: value"),
+    ]
+
+    tar_stream = files_to_tar_stream(files)
+
+    with tarfile.open(fileobj=tar_stream, mode="r") as tar:
+        assert tar.getnames() == ["config/crawl.yml", "config/other.yml"]
+
+        for file in files:
+            extracted_file = tar.extractfile(file.filename.lstrip("/"))
+            assert extracted_file is not None
+            assert extracted_file.read().decode("utf-8") == file.content
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("first_error", "expected_calls", "expected_exception"),
+    [
+        (DockerError(900, {"message": "Cannot connect to Docker Engine"}), 2, None),
+        (DockerError(404, {"message": "No such container"}), 1, DockerError),
+    ],
+    ids=["stale_connection_retried", "api_error_not_retried"],
+)
+async def test_retry_on_stale_connection(first_error: DockerError, expected_calls: int, expected_exception: type[Exception] | None):
+    """Tests that retry_on_stale_connection retries connection failures once and re-raises other Docker errors."""
+    docker_call = AsyncMock(side_effect=[first_error, "result"])
+    docker_call.__name__ = "docker_call"
+
+    wrapped = retry_on_stale_connection(docker_call)
+
+    if expected_exception:
+        with pytest.raises(expected_exception):
+            await wrapped()
+    else:
+        assert await wrapped() == "result"
+
+    assert docker_call.await_count == expected_calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("inspect_error", "expected_result", "expected_exception"),
+    [
+        (None, True, None),
+        (DockerError(404, {"message": "No such image"}), False, None),
+        (DockerError(500, {"message": "Internal server error"}), None, DockerError),
+    ],
+    ids=["present", "missing", "daemon_error"],
+)
+async def test_image_exists(inspect_error: DockerError | None, expected_result: bool | None, expected_exception: type[Exception] | None):
+    """Tests that image_exists reports missing images as False and re-raises other Docker errors."""
+    docker_client = MagicMock()
+    docker_client.images.inspect = AsyncMock(side_effect=inspect_error)
+
+    if expected_exception:
+        with pytest.raises(expected_exception):
+            await image_exists(docker_client, "crawler:latest")
+    else:
+        assert await image_exists(docker_client, "crawler:latest") is expected_result
+
+    docker_client.images.inspect.assert_awaited_once_with("crawler:latest")
+
+
+class MultiplexedLogContent:
+    """Stands in for the body of a Docker logs response, framed the way the daemon multiplexes stdout and stderr."""
+
+    def __init__(self, frames: list[bytes]):
+        self.buffer = b"".join(struct.pack(">BxxxL", 1, len(frame)) + frame for frame in frames)
+
+    async def readexactly(self, n: int) -> bytes:
+        if len(self.buffer) < n:
+            raise asyncio.IncompleteReadError(self.buffer, n)
+
+        data, self.buffer = self.buffer[:n], self.buffer[n:]
+        return data
+
+
+def mock_logs_docker_client(frames: list[bytes]) -> MagicMock:
+    """Builds a Docker client whose logs endpoint answers with the given multiplexed frames, read through aiodocker's container log API."""
+    docker_client = MagicMock()
+    docker_client.containers.container = lambda container_id: DockerContainer(docker_client, id=container_id)
+    docker_client._query_json = AsyncMock(return_value={"Config": {"Tty": False}})
+
+    @asynccontextmanager
+    async def query(*_args, **_kwargs):
+        yield MagicMock(content=MultiplexedLogContent(frames), release=AsyncMock())
+
+    docker_client._query = MagicMock(side_effect=query)
+
+    return docker_client
+
+
+# "é" and "☕" are both split between frames, as the daemon frames by bytes rather than characters
+SPLIT_CHARACTER_LOG = "crawled café ☕\n".encode()
+SPLIT_CHARACTER_FRAMES = [SPLIT_CHARACTER_LOG[:12], SPLIT_CHARACTER_LOG[12:16], SPLIT_CHARACTER_LOG[16:]]
+
+
+@pytest.mark.asyncio
+async def test_container_logs_decodes_characters_split_across_frames():
+    """Tests that container_logs keeps multi-byte characters split between frames intact."""
+    docker_client = mock_logs_docker_client(SPLIT_CHARACTER_FRAMES)
+
+    assert await container_logs(docker_client, "container-id") == SPLIT_CHARACTER_LOG.decode()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("tail", "expected_tail"), [(None, "all"), (100, 100)], ids=["all_lines", "last_lines"])
+async def test_container_logs_trims_in_the_daemon(tail: int | None, expected_tail: int | str):
+    """Tests that container_logs asks the Docker daemon for the requested number of lines, without following the container."""
+    docker_client = mock_logs_docker_client([b"crawled\n"])
+
+    await container_logs(docker_client, "container-id", tail=tail)
+
+    assert docker_client._query.call_args.kwargs["params"] == {"stdout": True, "stderr": True, "follow": False, "tail": expected_tail}
+
+
+@pytest.mark.asyncio
+async def test_remove_containers_bounds_concurrent_deletes():
+    """Tests that remove_containers deletes every matching container, never more than the bound at once."""
+    in_flight = 0
+    most_in_flight = 0
+
+    async def delete(**_kwargs):
+        nonlocal in_flight, most_in_flight
+        in_flight += 1
+        most_in_flight = max(most_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+    containers = [MagicMock(delete=AsyncMock(side_effect=delete)) for _ in range(MAX_CONCURRENT_REMOVALS * 3)]
+    docker_client = MagicMock()
+    docker_client.containers.list = AsyncMock(return_value=containers)
+
+    await remove_containers(docker_client, ["managed-by=mcp-crawler"])
+
+    assert all(container.delete.await_count == 1 for container in containers)
+    assert most_in_flight == MAX_CONCURRENT_REMOVALS
@@ -1,6 +1,34 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
+from elastic_transport import ApiResponseMeta, HttpHeaders, NodeConfig, ObjectApiResponse
 
 from es_knowledge_base_mcp.clients.es_knowledge_base import ElasticsearchKnowledgeBaseClient
+from es_knowledge_base_mcp.interfaces.knowledge_base import KnowledgeBase, KnowledgeBaseCreateProto, KnowledgeBaseDocumentProto
+
+KNOWLEDGE_BASE = KnowledgeBase(
+    name="Test KB",
+    type="web",
+    description="A test knowledge base",
+    data_source="https://example.com",
+    backend_id="kbmcp-web.example_com-1234abcd",
+    doc_count=0,
+)
+
+
+def mock_knowledge_base_client() -> tuple[ElasticsearchKnowledgeBaseClient, MagicMock]:
+    """Build a knowledge base client around a mocked AsyncElasticsearch client.
+
+    Returns:
+        tuple[ElasticsearchKnowledgeBaseClient, MagicMock]: The knowledge base client and the mocked Elasticsearch client.
+    """
+    elasticsearch_client = MagicMock()
+    elasticsearch_client.indices.get_mapping = AsyncMock(return_value=MagicMock(body={}))
+    elasticsearch_client.options.return_value.indices.stats = AsyncMock(return_value=MagicMock(body={}))
+
+    settings = MagicMock(base_index_prefix="kbmcp", base_index_pattern="kbmcp-*")
+
+    return ElasticsearchKnowledgeBaseClient(settings=settings, elasticsearch_client=elasticsearch_client), elasticsearch_client
 
 
 @pytest.mark.parametrize(
@@ -34,6 +62,67 @@ def test_url_to_index_name(url: str, expected_index_name: str):
     assert ElasticsearchKnowledgeBaseClient._url_to_index_name(url) == expected_index_name
 
 
+@pytest.mark.asyncio
+async def test_get_recent_documents_without_hits_returns_empty():
+    """Tests that the empty body filter_path leaves for an index with no documents is an empty result, not a warning."""
+    knowledge_base_client, elasticsearch_client = mock_knowledge_base_client()
+    # A real response, as an empty body makes it falsy
+    meta = ApiResponseMeta(
+        status=200, http_version="1.1", headers=HttpHeaders(), duration=0.0, node=NodeConfig(scheme="http", host="localhost", port=9200)
+    )
+    elasticsearch_client.search = AsyncMock(return_value=ObjectApiResponse(body={}, meta=meta))
+
+    with patch("es_knowledge_base_mcp.clients.es_knowledge_base.logger") as mock_logger:
+        documents = await knowledge_base_client.get_recent_documents(knowledge_base=KNOWLEDGE_BASE)
+
+    assert documents == []
+    mock_logger.warning.assert_not_called()
+
+
+async def create_knowledge_base(knowledge_base_client: ElasticsearchKnowledgeBaseClient) -> None:
+    """Create a knowledge base through the client."""
+    await knowledge_base_client.create(
+        KnowledgeBaseCreateProto(name="New KB", type="web", data_source="https://example.com/new", description="A new knowledge base")
+    )
+
+
+async def delete_knowledge_base(knowledge_base_client: ElasticsearchKnowledgeBaseClient) -> None:
+    """Delete a knowledge base through the client."""
+    await knowledge_base_client.delete(KNOWLEDGE_BASE)
+
+
+async def insert_documents(knowledge_base_client: ElasticsearchKnowledgeBaseClient) -> None:
+    """Insert a document into a knowledge base through the client."""
+    await knowledge_base_client.insert_documents(KNOWLEDGE_BASE, [KnowledgeBaseDocumentProto(title="Title", content="Content")])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "change_knowledge_bases",
+    [create_knowledge_base, delete_knowledge_base, insert_documents],
+    ids=["create", "delete", "insert_documents"],
+)
+async def test_changes_clear_cached_knowledge_bases(change_knowledge_bases):
+    """Tests that the knowledge base listing is reused between calls, and queried again after a change."""
+    knowledge_base_client, elasticsearch_client = mock_knowledge_base_client()
+    elasticsearch_client.indices.create = AsyncMock()
+    elasticsearch_client.indices.delete = AsyncMock()
+    elasticsearch_client.bulk = AsyncMock(return_value={"errors": False})
+    knowledge_base_client.get.cache_clear()
+
+    await knowledge_base_client.get()
+    await knowledge_base_client.get()
+
+    assert elasticsearch_client.indices.get_mapping.await_count == 1
+
+    await change_knowledge_bases(knowledge_base_client)
+    get_mapping_calls = elasticsearch_client.indices.get_mapping.await_count
+
+    await knowledge_base_client.get()
+
+    assert elasticsearch_client.indices.get_mapping.await_count == get_mapping_calls + 1
+
+
 # @pytest.mark.parametrize(
 #     "kb_create_proto",
 #     [
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("orjson")
+
+from es_knowledge_base_mcp.models.settings import ELASTICSEARCH_SERIALIZERS, OrjsonNdjsonSerializer
+
+
+def test_orjson_ndjson_serializer_round_trips():
+    """Tests that the orjson NDJSON serializer writes one compact line per document and reads them back."""
+    serializer = OrjsonNdjsonSerializer()
+    documents = [{"index": {"_id": "1"}}, {"title": "café", "count": 2}]
+
+    encoded = serializer.dumps(documents)
+
+    assert encoded == '{"index":{"_id":"1"}}\n{"title":"café","count":2}\n'.encode()
+    assert serializer.loads(encoded) == documents
+
+
+def test_elasticsearch_serializers_cover_json_and_ndjson():
+    """Tests that orjson serializers replace the client defaults for both JSON and NDJSON bodies."""
+    assert set(ELASTICSEARCH_SERIALIZERS) == {"application/json", "application/x-ndjson"}
+    assert isinstance(ELASTICSEARCH_SERIALIZERS["application/x-ndjson"], OrjsonNdjsonSerializer)
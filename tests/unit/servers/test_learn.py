@@ -0,0 +1,117 @@
+import asyncio
+import gc
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from es_knowledge_base_mcp.errors.crawler import CrawlerValidationError
+from es_knowledge_base_mcp.errors.knowledge_base import KnowledgeBaseRetrievalError
+from es_knowledge_base_mcp.servers.learn import CrawlStartFailure, CrawlStartSuccess, LearnServer, LearnWebDocumentationProto
+
+
+def mock_learn_server() -> tuple[LearnServer, MagicMock]:
+    """Build a learn server around a mocked knowledge base client.
+
+    Returns:
+        tuple[LearnServer, MagicMock]: The learn server and the mocked knowledge base client.
+    """
+    knowledge_base_client = MagicMock()
+    learn_server = LearnServer(
+        knowledge_base_client=knowledge_base_client, crawler_settings=MagicMock(max_concurrent_starts=1), elasticsearch_settings=MagicMock()
+    )
+
+    return learn_server, knowledge_base_client
+
+
+def learn_proto(name: str, data_source: str) -> LearnWebDocumentationProto:
+    """Build the parameters for learning from a web documentation source.
+
+    Returns:
+        LearnWebDocumentationProto: The learn parameters.
+    """
+    return LearnWebDocumentationProto(name=name, data_source=data_source, description=f"Documentation for {name}")
+
+
+@pytest.mark.asyncio
+async def test_from_web_documentation_retrieves_failed_lookup_on_validation_failure():
+    """Tests that a knowledge base lookup which already failed is retrieved when validation fails, not reported as unretrieved."""
+    learn_server, knowledge_base_client = mock_learn_server()
+    knowledge_base_client.try_get_by_name = AsyncMock(side_effect=KnowledgeBaseRetrievalError("Elasticsearch is unavailable"))
+
+    async def validate_crawl(*_args, **_kwargs):
+        # Let the lookup fail before validation does
+        await asyncio.sleep(0)
+        raise CrawlerValidationError(message="Too many child pages")
+
+    unhandled_exceptions: list[dict] = []
+    asyncio.get_running_loop().set_exception_handler(lambda _loop, context: unhandled_exceptions.append(context))
+
+    with patch("es_knowledge_base_mcp.servers.learn.Crawler.validate_crawl", side_effect=validate_crawl):
+        result = await learn_server.from_web_documentation(learn_web_documentation_proto=learn_proto("Docs", "https://example.com/docs/"))
+
+    gc.collect()
+
+    assert isinstance(result, CrawlStartFailure)
+    assert unhandled_exceptions == []
+
+
+@pytest.mark.asyncio
+async def test_from_web_documentation_waits_for_cancelled_lookup_on_validation_failure():
+    """Tests that a knowledge base lookup still in flight when validation fails has finished cancelling before the result is returned."""
+    learn_server, knowledge_base_client = mock_learn_server()
+    lookup_cancelled = False
+
+    async def try_get_by_name(_name: str):
+        nonlocal lookup_cancelled
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            lookup_cancelled = True
+            raise
+
+    knowledge_base_client.try_get_by_name = try_get_by_name
+
+    async def validate_crawl(*_args, **_kwargs):
+        # Let the lookup start before validation fails
+        await asyncio.sleep(0)
+        raise CrawlerValidationError(message="Too many child pages")
+
+    with patch("es_knowledge_base_mcp.servers.learn.Crawler.validate_crawl", side_effect=validate_crawl):
+        result = await learn_server.from_web_documentation(learn_web_documentation_proto=learn_proto("Docs", "https://example.com/docs/"))
+
+    assert isinstance(result, CrawlStartFailure)
+    assert lookup_cancelled
+
+
+@pytest.mark.asyncio
+async def test_from_many_web_documentation():
+    """Tests that crawls are started concurrently, with results in request order, failures reported and repeated names rejected."""
+    learn_server, _ = mock_learn_server()
+    protos = [
+        learn_proto("First", "https://example.com/first/"),
+        learn_proto("Second", "https://example.com/second/"),
+        learn_proto("Failing", "https://example.com/failing/"),
+        learn_proto("First", "https://example.com/first-again/"),
+    ]
+
+    async def from_web_documentation(learn_web_documentation_proto: LearnWebDocumentationProto, max_child_page_limit: int):
+        assert max_child_page_limit == 10
+
+        if learn_web_documentation_proto.name == "Failing":
+            msg = "Docker is unavailable"
+            raise RuntimeError(msg)
+
+        # Earlier requests finish last, so the results only come back in order if they are put back in request order
+        await asyncio.sleep(0.01 * (len(protos) - protos.index(learn_web_documentation_proto)))
+        return CrawlStartSuccess(
+            url=learn_web_documentation_proto.data_source, knowledge_base_id=learn_web_documentation_proto.name, container_id="container-id"
+        )
+
+    with patch.object(learn_server, "from_web_documentation", side_effect=from_web_documentation) as mock_from_web_documentation:
+        results = await learn_server.from_many_web_documentation(learn_web_documentation_protos=protos, max_child_page_limit=10)
+
+    assert [result.url for result in results] == [proto.data_source for proto in protos]
+    assert [type(result) for result in results] == [CrawlStartSuccess, CrawlStartSuccess, CrawlStartFailure, CrawlStartFailure]
+    assert results[2].reason == "Docker is unavailable"
+    assert "more than once" in results[3].reason
+    assert mock_from_web_documentation.await_count == len(protos) - 1